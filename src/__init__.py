@@ -25,7 +25,10 @@ __version__ = "2.0.0"
 __author__ = "Research Team"
 __email__ = "research@hospital.org"
 
-from .core import TRSCalculator, TRSResult
+from .core import (
+    TRSCalculator, TRSResult, ComponentInfo, default_calculator,
+    calculate_score, calculate_batch
+)
 from .constants import TRS_CONSTANTS, RISK_CATEGORIES
 from .validation import BootstrapValidator, PerformanceMetrics
 from .utils import calculate_youden_index, format_clinical_output
@@ -33,6 +36,10 @@ from .utils import calculate_youden_index, format_clinical_output
 __all__ = [
     "TRSCalculator",
     "TRSResult", 
+    "ComponentInfo",
+    "default_calculator",
+    "calculate_score",
+    "calculate_batch",
     "TRS_CONSTANTS",
     "RISK_CATEGORIES",
     "BootstrapValidator",
@@ -5,21 +5,27 @@ All values are derived from the optimal cut-point analysis as documented
 in Supplementary Table S1 of the accompanying manuscript.
 """
 
+from types import MappingProxyType
 from typing import Dict, Any
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
 
+# The scoring tables below are read-only views (MappingProxyType): they are
+# shared by every calculator and precomputed lookup tables, so mutating them
+# at runtime would silently desynchronize results.
+
 # TRS Component Cut-points (from Optimal Cut-point Analysis)
-TRS_CUTPOINTS = {
+TRS_CUTPOINTS = MappingProxyType({
     "MELD": 20,      # Sensitivity: 78.6%, Specificity: 69.1%, Youden: 0.477
     "SAPS_II": 42,   # Sensitivity: 75.0%, Specificity: 65.5%, Youden: 0.405  
     "AGE": 52,       # Sensitivity: 67.9%, Specificity: 58.2%, Youden: 0.261
     "PLATELETS": 78, # Sensitivity: 71.4%, Specificity: 63.6%, Youden: 0.350
-}
+})
 
 # Point Assignments (based on hazard ratios and statistical significance)
-TRS_POINTS = {
+TRS_POINTS = MappingProxyType({
     "MELD": 2,       # HR: 3.24 (95% CI: 1.58-6.63), p=0.001
     "SAPS_II": 1,    # HR: 4.50 (95% CI: 1.73-11.70), p=0.002
     "AGE": 1,        # HR: 2.04 (95% CI: 0.84-4.95), p=0.115
@@ -27,35 +33,52 @@ TRS_POINTS = {
     "HCC": 1,        # OR: 2.89 (95% CI: 1.12-7.45), p=0.032
     "CVVHD": 1,      # OR: 1.78 (95% CI: 0.71-4.47), p=0.212
     "VHF": 1,        # OR: 1.95 (95% CI: 0.65-5.84), p=0.243
-}
+})
+
+# Fixed component order used for array-based (batch) scoring
+COMPONENT_ORDER = ("MELD", "SAPS_II", "AGE", "PLATELETS", "HCC", "CVVHD", "VHF")
+COMPONENT_INDEX = {component: i for i, component in enumerate(COMPONENT_ORDER)}
+
+# Bit assigned to each component in a patient's hit mask (2^7 = 128 possible patterns)
+COMPONENT_BITS = {component: 1 << i for i, component in enumerate(COMPONENT_ORDER)}
 
 # Maximum possible TRS score
 MAX_SCORE = sum(TRS_POINTS.values())  # = 8 points
 
 # Risk Categories (based on 90-day mortality rates)
-RISK_CATEGORIES = {
-    "LOW": {
+RISK_CATEGORIES = MappingProxyType({
+    "LOW": MappingProxyType({
         "range": (0, 1),
         "mortality_rate": 0.10,
         "description": "Low Risk",
         "recommendation": "Standard weaning protocol",
         "color": "green"
-    },
-    "MEDIUM": {
+    }),
+    "MEDIUM": MappingProxyType({
         "range": (2, 2),  # Changed from (2,3) since HIGH now starts at 3
         "mortality_rate": 0.33,
         "description": "Medium Risk",
         "recommendation": "Enhanced monitoring and assessment",
         "color": "orange"
-    },
-    "HIGH": {
+    }),
+    "HIGH": MappingProxyType({
         "range": (3, 8),  # Changed from (4,8) to align with optimal threshold ≥3
         "mortality_rate": 0.46,
         "description": "High Risk", 
         "recommendation": "Consider early tracheostomy (Day 5-7)",
         "color": "red"
-    }
-}
+    })
+})
+
+# Risk category for every attainable score (index 0..MAX_SCORE); None marks a gap
+SCORE_CATEGORIES = tuple(
+    next(
+        (category for category, data in RISK_CATEGORIES.items()
+         if data["range"][0] <= score <= data["range"][1]),
+        None
+    )
+    for score in range(MAX_SCORE + 1)
+)
 
 # Optimal Decision Thresholds (from Landmark Analysis)
 OPTIMAL_THRESHOLDS = {
@@ -205,10 +228,14 @@ TRS_CONSTANTS = {
     "validation": VALIDATION_SETTINGS,
 }
 
+@functools.lru_cache(maxsize=1)
 def validate_constants() -> bool:
     """
     Validate that all constants are properly defined and consistent.
     
+    The constants are module-level and fixed, so the result is cached and the
+    checks run once per process.
+    
     Returns:
         bool: True if all validations pass
         
@@ -231,6 +258,11 @@ def validate_constants() -> bool:
             if not (range1[1] < range2[0] or range2[1] < range1[0]):
                 raise ValueError(f"Overlapping risk category ranges: {range1} and {range2}")
     
+    # Check that every attainable score maps to a risk category
+    uncovered = [score for score, category in enumerate(SCORE_CATEGORIES) if category is None]
+    if uncovered:
+        raise ValueError(f"Scores not covered by any risk category: {uncovered}")
+    
     # Check that optimal threshold is within valid TRS range
     max_score = sum(TRS_POINTS.values())
     for day, threshold_data in OPTIMAL_THRESHOLDS.items():
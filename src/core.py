@@ -5,47 +5,352 @@ This module contains the main TRSCalculator class and related functionality
 for calculating Tracheostomy Risk Scores.
 """
 
-from dataclasses import dataclass
-from typing import Optional, Dict, Any, List, Tuple
+from collections import abc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import Optional, Dict, Any, Callable, ClassVar, Iterator, List, Mapping, Tuple, Union
+import functools
 import logging
+import sys
+import threading
+import time
 from datetime import datetime
+from itertools import repeat
+import operator
 
-from constants import TRS_CUTPOINTS, TRS_POINTS, RISK_CATEGORIES, VARIABLE_DEFINITIONS
+import numpy as np
+
+from constants import (
+    TRS_CUTPOINTS, TRS_POINTS, RISK_CATEGORIES, VARIABLE_DEFINITIONS,
+    COMPONENT_ORDER, COMPONENT_INDEX, COMPONENT_BITS, SCORE_CATEGORIES
+)
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _configure_logging() -> None:
+    """Attach the console handler once per process, not per calculator."""
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+
+_configure_logging()
+
+# Slotted dataclasses need Python 3.10+; older interpreters get a regular dataclass
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Risk category lookup indexed by score (0..MAX_SCORE)
+_CATEGORY_BY_SCORE = tuple((category, RISK_CATEGORIES[category]) for category in SCORE_CATEGORIES)
+_CATEGORY_LABELS = np.array(SCORE_CATEGORIES)
+
+# Scoring rules in COMPONENT_ORDER: (component, cut-point, points, comparison).
+# Boolean components score when present (value > 0).
+_SCORING_RULES = (
+    ("MELD", TRS_CUTPOINTS["MELD"], TRS_POINTS["MELD"], operator.gt),
+    ("SAPS_II", TRS_CUTPOINTS["SAPS_II"], TRS_POINTS["SAPS_II"], operator.gt),
+    ("AGE", TRS_CUTPOINTS["AGE"], TRS_POINTS["AGE"], operator.gt),
+    ("PLATELETS", TRS_CUTPOINTS["PLATELETS"], TRS_POINTS["PLATELETS"], operator.lt),
+    ("HCC", 0, TRS_POINTS["HCC"], operator.gt),
+    ("CVVHD", 0, TRS_POINTS["CVVHD"], operator.gt),
+    ("VHF", 0, TRS_POINTS["VHF"], operator.gt),
+)
+
+# Patient data keys in COMPONENT_ORDER (meld, saps_ii, ...)
+_INPUT_KEYS = tuple(component.lower() for component in COMPONENT_ORDER)
+
+# Valid ranges for the continuous components (leading COMPONENT_ORDER entries):
+# (label used in error messages, minimum, maximum)
+_VALID_RANGES = tuple(
+    (label, *VARIABLE_DEFINITIONS[component]["range"])
+    for label, component in (
+        ("MELD score", "MELD"),
+        ("SAPS II score", "SAPS_II"),
+        ("Age", "AGE"),
+        ("Platelet count", "PLATELETS"),
+    )
+)
+_RANGE_LOW = np.array([low for _, low, _ in _VALID_RANGES])
+_RANGE_HIGH = np.array([high for _, _, high in _VALID_RANGES])
+
+# Detail lines in COMPONENT_ORDER: (criterion met, criterion not met). Cut-points and
+# points are filled in here; continuous lines keep one %-field for the input value.
+_DETAIL_TEMPLATES = (
+    (f"MELD > {TRS_CUTPOINTS['MELD']} (%.1f): +{TRS_POINTS['MELD']} points",
+     f"MELD ≤ {TRS_CUTPOINTS['MELD']} (%.1f): +0 points"),
+    (f"SAPS II > {TRS_CUTPOINTS['SAPS_II']} (%.1f): +{TRS_POINTS['SAPS_II']} points",
+     f"SAPS II ≤ {TRS_CUTPOINTS['SAPS_II']} (%.1f): +0 points"),
+    (f"Age > {TRS_CUTPOINTS['AGE']} (%.0f years): +{TRS_POINTS['AGE']} points",
+     f"Age ≤ {TRS_CUTPOINTS['AGE']} (%.0f years): +0 points"),
+    (f"Platelets < {TRS_CUTPOINTS['PLATELETS']} (%.0f): +{TRS_POINTS['PLATELETS']} points",
+     f"Platelets ≥ {TRS_CUTPOINTS['PLATELETS']} (%.0f): +0 points"),
+    (f"Hepatocellular carcinoma present: +{TRS_POINTS['HCC']} points",
+     "Hepatocellular carcinoma absent: +0 points"),
+    (f"Continuous veno-venous hemodialysis present: +{TRS_POINTS['CVVHD']} points",
+     "Continuous veno-venous hemodialysis absent: +0 points"),
+    (f"Atrial fibrillation present: +{TRS_POINTS['VHF']} points",
+     "Atrial fibrillation absent: +0 points"),
+)
+
+# Missing-input warnings in COMPONENT_ORDER
+_MISSING_WARNINGS = (
+    "MELD score missing",
+    "SAPS II score missing",
+    "Age missing",
+    "Platelet count missing",
+    "HCC status missing",
+    "CVVHD status missing",
+    "Atrial fibrillation status missing",
+)
+
+# Scalar-path view of _SCORING_RULES: (cut-point, comparison, hit-mask bit, missing warning)
+_SCALAR_RULES = tuple(
+    (cutpoint, compare, COMPONENT_BITS[component], warning)
+    for (component, cutpoint, _, compare), warning in zip(_SCORING_RULES, _MISSING_WARNINGS)
+)
+
+# Array form of _SCORING_RULES for the vectorized kernel. "value < cut" rules are
+# negated on both sides so every column reduces to one broadcast "value > cut".
+_CUTPOINTS_ARR = np.array([cutpoint for _, cutpoint, _, _ in _SCORING_RULES], dtype=float)
+_POINTS_ARR = np.array([points for _, _, points, _ in _SCORING_RULES], dtype=np.int8)
+_DIRECTION_ARR = np.array(
+    [-1.0 if compare is operator.lt else 1.0 for _, _, _, compare in _SCORING_RULES]
+)
+_THRESHOLDS_ARR = _CUTPOINTS_ARR * _DIRECTION_ARR
+
+# Lookup tables indexed by hit mask: component points (128 x 7) and total score (128,)
+_MASK_BITS = np.array([COMPONENT_BITS[component] for component in COMPONENT_ORDER])
+_COMPONENTS_FROM_MASK = (
+    (np.arange(2 ** len(COMPONENT_ORDER))[:, None] & _MASK_BITS > 0) * _POINTS_ARR
+).astype(np.int8)
+SCORE_FROM_MASK = _COMPONENTS_FROM_MASK.sum(axis=1).astype(np.int8)
+# Rows are shared as TRSResult.component_scores, so the table must stay read-only
+_COMPONENTS_FROM_MASK.setflags(write=False)
+# Python-int copy of SCORE_FROM_MASK for the scalar path
+_SCORE_BY_MASK = tuple(SCORE_FROM_MASK.tolist())
+
+# Missing-input warnings indexed by the missing-component mask (same bit layout)
+_WARNINGS_FROM_MISSING_MASK = tuple(
+    tuple(
+        message for message, bit in zip(_MISSING_WARNINGS, _MASK_BITS.tolist())
+        if mask & bit
+    )
+    for mask in range(2 ** len(COMPONENT_ORDER))
+)
+
+
+def _build_details(values: Tuple[Any, ...], component_scores: np.ndarray) -> List[str]:
+    """Render the per-component breakdown lines for the non-missing inputs."""
+    # One %-format per continuous line beats a shared format_map context,
+    # flat or ChainMap, since the cut-points and points are already filled in
+    details = []
+    for templates, value, score in zip(_DETAIL_TEMPLATES, values, component_scores.tolist()):
+        if value is not None:
+            template = templates[0 if score else 1]
+            details.append(template % value if "%" in template else template)
+    return details
+
+
+def _input_matrix(data: Mapping[str, Any]) -> np.ndarray:
+    """Stack input columns into an (N, 7) float matrix in COMPONENT_ORDER (NaN = missing)."""
+    columns = [data[key] if key in data else None for key in _INPUT_KEYS]
+    n_patients = max(
+        (np.size(column) for column in columns if column is not None), default=0
+    )
+    values = np.full((n_patients, len(COMPONENT_ORDER)), np.nan)
+    for i, column in enumerate(columns):
+        if column is not None:
+            values[:, i] = np.asarray(column, dtype=float).reshape(n_patients)
+    return values
+
+
+def _batch_columns(patients_data: Any) -> Mapping[str, Any]:
+    """Column view of batch input: a list of patient dicts is transposed, a
+    DataFrame or mapping of columns is used as is."""
+    if isinstance(patients_data, (list, tuple)):
+        return {
+            key: [patient_data.get(key) for patient_data in patients_data]
+            for key in _INPUT_KEYS
+        }
+    return patients_data
+
+
+def _column_row(columns: Mapping[str, Any], index: int, missing: np.ndarray) -> Dict[str, Any]:
+    """Patient dict for row ``index`` (by position) of column input, holding the
+    original values so a rejected row is re-scored and reported as given."""
+    patient_data = {
+        key: None if is_missing else np.asarray(columns[key])[index]
+        for key, is_missing in zip(_INPUT_KEYS, missing.tolist())
+    }
+    if "patient_id" in columns:
+        patient_data['patient_id'] = np.asarray(columns["patient_id"])[index]
+    return patient_data
+
+
+def _out_of_range(values: np.ndarray) -> np.ndarray:
+    """(N, 4) mask of continuous inputs outside their valid range (NaN passes)."""
+    continuous = values[:, :len(_VALID_RANGES)]
+    return (continuous < _RANGE_LOW) | (continuous > _RANGE_HIGH)
+
+
+def _rejected_rows(values: np.ndarray, columns: Mapping[str, Any], from_dicts: bool) -> np.ndarray:
+    """
+    (N,) mask of batch rows that calculate_score would reject.
+    
+    In patient dicts a NaN that was actually given fails the range check like
+    any other bad value (only an absent key or None means missing); in
+    DataFrame/column input NaN is the missing-value marker.
+    """
+    rejected = _out_of_range(values).any(axis=1)
+    if from_dicts:
+        given = np.array(
+            [[value is not None for value in columns[key]]
+             for key in _INPUT_KEYS[:len(_VALID_RANGES)]],
+            dtype=bool
+        ).reshape(len(_VALID_RANGES), -1).T
+        rejected |= (given & np.isnan(values[:, :len(_VALID_RANGES)])).any(axis=1)
+    return rejected
+
+
+def _score_kernel(values: np.ndarray) -> np.ndarray:
+    """
+    Pure-numeric TRS kernel shared by all array-based scoring paths.
+    
+    Args:
+        values: (N, 7) float matrix of inputs in COMPONENT_ORDER (NaN = missing)
+        
+    Returns:
+        np.ndarray: (N,) uint8 hit mask, one COMPONENT_BITS bit per criterion met
+    """
+    hits = values * _DIRECTION_ARR > _THRESHOLDS_ARR
+    return np.packbits(hits, axis=1, bitorder="little").reshape(values.shape[0])
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class ComponentInfo(abc.Mapping):
+    """
+    Read-only description of a TRS component.
+    
+    Fields are read as attributes; mapping access (``info["cutpoint"]``) is kept
+    for dict-style callers and only exposes fields that are set.
+    
+    Attributes:
+        name: Full component name
+        unit: Measurement unit ("boolean" for binary components)
+        description: Clinical rationale for the component
+        range: Valid (min, max) input range for continuous components
+        cutpoint: Scoring cutpoint for continuous components
+        points: Points contributed when the component is positive
+    """
+    name: str
+    unit: str
+    description: str
+    range: Optional[Tuple[float, float]] = None
+    cutpoint: Optional[int] = None
+    points: Optional[int] = None
+    
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, key, None) if key in _COMPONENT_INFO_FIELDS else None
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in _COMPONENT_INFO_FIELDS if getattr(self, key) is not None)
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+_COMPONENT_INFO_FIELDS = tuple(f.name for f in fields(ComponentInfo))
+
+# Built once at import; instances are immutable and shared by every caller
+_COMPONENT_INFO = {
+    component: ComponentInfo(
+        **definition,
+        cutpoint=TRS_CUTPOINTS.get(component),
+        points=TRS_POINTS.get(component),
+    )
+    for component, definition in VARIABLE_DEFINITIONS.items()
+}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class TRSResult:
     """
     Result of TRS calculation with detailed breakdown.
     
     Attributes:
         total_score: Total TRS score (0-8)
-        component_scores: Dictionary of individual component contributions
+        component_scores: Component contributions as an int8 array in COMPONENT_ORDER
+            (a {component: points} mapping is accepted and converted);
+            ``result["MELD"]`` reads a single component
         risk_category: Risk category (LOW, MEDIUM, HIGH)
         risk_description: Human-readable risk description
         recommendation: Clinical recommendation
         mortality_risk: Estimated 90-day mortality risk
-        details: Detailed calculation breakdown
-        timestamp: When calculation was performed
+        details: Detailed calculation breakdown (empty unless log_calculations is
+            enabled or a patient_id was given)
+        timestamp: When calculation was performed, in nanoseconds since the epoch
+            (None if not recorded); a datetime is accepted and converted.
+            ``calculated_at`` gives it as a datetime.
         valid: Whether the calculation is valid
         warnings: Any warnings about the calculation
     """
+    # Order of the entries of component_scores
+    COMPONENT_ORDER: ClassVar[Tuple[str, ...]] = COMPONENT_ORDER
+    
     total_score: int
-    component_scores: Dict[str, int]
+    component_scores: np.ndarray
     risk_category: str
     risk_description: str
     recommendation: str
     mortality_risk: float
     details: List[str]
-    timestamp: datetime
+    timestamp: Optional[int]
     valid: bool = True
-    warnings: List[str] = None
+    warnings: List[str] = field(default_factory=list)
     
     def __post_init__(self):
-        if self.warnings is None:
-            self.warnings = []
+        if isinstance(self.timestamp, datetime):
+            self.timestamp = round(self.timestamp.timestamp() * 1_000_000) * 1000
+        if type(self.component_scores) is not np.ndarray and isinstance(self.component_scores, Mapping):
+            scores = np.zeros(len(COMPONENT_ORDER), dtype=np.int8)
+            for component, points in self.component_scores.items():
+                scores[COMPONENT_INDEX[component]] = points
+            self.component_scores = scores
+    
+    def __eq__(self, other: object) -> bool:
+        # Generated == would need a single truth value from the array comparison
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(
+            np.array_equal(getattr(self, f.name), getattr(other, f.name))
+            if f.name == "component_scores"
+            else getattr(self, f.name) == getattr(other, f.name)
+            for f in fields(self)
+        )
+    
+    def __getitem__(self, component: str) -> int:
+        """Points contributed by a single component."""
+        return int(self.component_scores[COMPONENT_INDEX[component]])
+    
+    @property
+    def calculated_at(self) -> Optional[datetime]:
+        """Calculation time as a local datetime (None if not recorded)."""
+        if self.timestamp is None:
+            return None
+        return datetime.fromtimestamp(self.timestamp / 1e9)
+    
+    @property
+    def component_dict(self) -> Dict[str, int]:
+        """Component contributions as a {component: points} dictionary."""
+        return dict(zip(COMPONENT_ORDER, self.component_scores.tolist()))
 
 
 class TRSCalculator:
@@ -66,31 +371,59 @@ class TRSCalculator:
         >>> print(f"Risk: {result.risk_category}")
     """
     
-    def __init__(self, validate_inputs: bool = True, log_calculations: bool = True):
+    def __init__(
+        self,
+        validate_inputs: bool = True,
+        log_calculations: bool = True,
+        record_time: bool = True
+    ):
         """
         Initialize TRS Calculator.
         
         Args:
             validate_inputs: Whether to validate input ranges
-            log_calculations: Whether to log calculation details
+            log_calculations: Whether to log calculations and build the per-component
+                details breakdown (always built for calls with a patient_id)
+            record_time: Whether to timestamp results (disable for bootstrap loops)
         """
-        self.validate_inputs = validate_inputs
-        self.log_calculations = log_calculations
-        self._setup_logging()
-        
-        if self.log_calculations:
-            logger.info("TRS Calculator initialized")
-    
-    def _setup_logging(self) -> None:
-        """Setup logging configuration."""
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-            logger.setLevel(logging.INFO)
+        self._validation_enabled = validate_inputs
+        self._logging_enabled = log_calculations
+        self.record_time = record_time
+        self._bind_scorer()
+    
+    @property
+    def validate_inputs(self) -> bool:
+        """Whether inputs are range-checked (by every scoring path)."""
+        return self._validation_enabled
+    
+    @validate_inputs.setter
+    def validate_inputs(self, value: bool) -> None:
+        self._validation_enabled = value
+        self._bind_scorer()
+    
+    @property
+    def log_calculations(self) -> bool:
+        """Whether calculations are logged and detail breakdowns built."""
+        return self._logging_enabled
+    
+    @log_calculations.setter
+    def log_calculations(self, value: bool) -> None:
+        self._logging_enabled = value
+        self._bind_scorer()
+    
+    def _bind_scorer(self) -> None:
+        """Rebuild the scorer specialized for the current flags (see _make_scorer)."""
+        self._scorer = self._make_scorer(self._validation_enabled, self._logging_enabled)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # The specialized scorer is a closure; rebuild it after unpickling
+        state = self.__dict__.copy()
+        del state["_scorer"]
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._bind_scorer()
     
     def calculate_score(
         self,
@@ -101,7 +434,8 @@ class TRSCalculator:
         hcc: Optional[bool] = None,
         cvvhd: Optional[bool] = None,
         vhf: Optional[bool] = None,
-        patient_id: Optional[str] = None
+        patient_id: Optional[str] = None,
+        timestamp: Optional[int] = None
     ) -> TRSResult:
         """
         Calculate TRS score for a patient.
@@ -115,6 +449,8 @@ class TRSCalculator:
             cvvhd: Continuous veno-venous hemodialysis
             vhf: Atrial fibrillation present
             patient_id: Optional patient identifier for logging
+            timestamp: Timestamp (ns since the epoch) to record instead of the
+                current time
             
         Returns:
             TRSResult: Complete calculation result
@@ -122,120 +458,96 @@ class TRSCalculator:
         Raises:
             ValueError: If inputs are invalid or insufficient data provided
         """
-        timestamp = datetime.now()
+        return self._scorer(meld, saps_ii, age, platelets, hcc, cvvhd, vhf, patient_id, timestamp)
+    
+    def _make_scorer(self, validate_inputs: bool, log_calculations: bool) -> Callable[..., TRSResult]:
+        """
+        Build calculate_score specialized for fixed validation/logging flags.
         
-        if self.log_calculations and patient_id:
-            logger.info(f"Calculating TRS for patient {patient_id}")
+        With both flags off this is the bare _score kernel; otherwise a thin
+        wrapper adds only the enabled steps, so no flag is re-read per call.
+        """
+        score = self._score
+        if not (validate_inputs or log_calculations):
+            return score
+        validate = self._validate_inputs
         
-        # Validate inputs
-        if self.validate_inputs:
-            self._validate_inputs(meld, saps_ii, age, platelets, hcc, cvvhd, vhf)
+        def scorer(
+            meld: Optional[float] = None,
+            saps_ii: Optional[float] = None,
+            age: Optional[float] = None,
+            platelets: Optional[float] = None,
+            hcc: Optional[bool] = None,
+            cvvhd: Optional[bool] = None,
+            vhf: Optional[bool] = None,
+            patient_id: Optional[str] = None,
+            timestamp: Optional[int] = None
+        ) -> TRSResult:
+            if log_calculations and patient_id:
+                logger.info("Calculating TRS for patient %s", patient_id)
+            
+            if validate_inputs:
+                validate(meld, saps_ii, age, platelets, hcc, cvvhd, vhf)
+            
+            result = score(meld, saps_ii, age, platelets, hcc, cvvhd, vhf, patient_id, timestamp)
+            
+            if log_calculations:
+                if patient_id is None:
+                    # _score already rendered details for identified patients
+                    result.details = _build_details(
+                        (meld, saps_ii, age, platelets, hcc, cvvhd, vhf), result.component_scores
+                    )
+                logger.info(
+                    "TRS calculation complete: Score=%d, Risk=%s",
+                    result.total_score, result.risk_category
+                )
+            return result
         
-        # Check for missing data
-        missing_components = self._check_missing_data(
-            meld, saps_ii, age, platelets, hcc, cvvhd, vhf
-        )
+        return scorer
+    
+    def _score(
+        self,
+        meld: Optional[float] = None,
+        saps_ii: Optional[float] = None,
+        age: Optional[float] = None,
+        platelets: Optional[float] = None,
+        hcc: Optional[bool] = None,
+        cvvhd: Optional[bool] = None,
+        vhf: Optional[bool] = None,
+        patient_id: Optional[str] = None,
+        timestamp: Optional[int] = None
+    ) -> TRSResult:
+        """Score one patient without validation or logging (details only for a patient_id)."""
+        if timestamp is None and self.record_time:
+            timestamp = time.time_ns()
         
-        # Calculate component scores
-        component_scores = {}
-        details = []
+        # Collect the hit mask and missing-data warnings in a single pass over
+        # the scoring rules; the component row and total then come from the
+        # mask lookup tables
         warnings = []
-        total_score = 0
+        hit_mask = 0
+        values = (meld, saps_ii, age, platelets, hcc, cvvhd, vhf)
         
-        # MELD component (2 points if >20)
-        if meld is not None:
-            if meld > TRS_CUTPOINTS["MELD"]:
-                component_scores["MELD"] = TRS_POINTS["MELD"]
-                total_score += TRS_POINTS["MELD"]
-                details.append(f"MELD > {TRS_CUTPOINTS['MELD']} ({meld:.1f}): +{TRS_POINTS['MELD']} points")
-            else:
-                component_scores["MELD"] = 0
-                details.append(f"MELD ≤ {TRS_CUTPOINTS['MELD']} ({meld:.1f}): +0 points")
-        else:
-            warnings.append("MELD score missing")
-            
-        # SAPS II component (1 point if >42)
-        if saps_ii is not None:
-            if saps_ii > TRS_CUTPOINTS["SAPS_II"]:
-                component_scores["SAPS_II"] = TRS_POINTS["SAPS_II"]
-                total_score += TRS_POINTS["SAPS_II"]
-                details.append(f"SAPS II > {TRS_CUTPOINTS['SAPS_II']} ({saps_ii:.1f}): +{TRS_POINTS['SAPS_II']} points")
-            else:
-                component_scores["SAPS_II"] = 0
-                details.append(f"SAPS II ≤ {TRS_CUTPOINTS['SAPS_II']} ({saps_ii:.1f}): +0 points")
-        else:
-            warnings.append("SAPS II score missing")
-            
-        # Age component (1 point if >52)
-        if age is not None:
-            if age > TRS_CUTPOINTS["AGE"]:
-                component_scores["AGE"] = TRS_POINTS["AGE"]
-                total_score += TRS_POINTS["AGE"]
-                details.append(f"Age > {TRS_CUTPOINTS['AGE']} ({age:.0f} years): +{TRS_POINTS['AGE']} points")
-            else:
-                component_scores["AGE"] = 0
-                details.append(f"Age ≤ {TRS_CUTPOINTS['AGE']} ({age:.0f} years): +0 points")
-        else:
-            warnings.append("Age missing")
-            
-        # Platelets component (1 point if <78)
-        if platelets is not None:
-            if platelets < TRS_CUTPOINTS["PLATELETS"]:
-                component_scores["PLATELETS"] = TRS_POINTS["PLATELETS"]
-                total_score += TRS_POINTS["PLATELETS"]
-                details.append(f"Platelets < {TRS_CUTPOINTS['PLATELETS']} ({platelets:.0f}): +{TRS_POINTS['PLATELETS']} points")
-            else:
-                component_scores["PLATELETS"] = 0
-                details.append(f"Platelets ≥ {TRS_CUTPOINTS['PLATELETS']} ({platelets:.0f}): +0 points")
-        else:
-            warnings.append("Platelet count missing")
-            
-        # HCC component (1 point if present)
-        if hcc is not None:
-            if hcc:
-                component_scores["HCC"] = TRS_POINTS["HCC"]
-                total_score += TRS_POINTS["HCC"]
-                details.append(f"Hepatocellular carcinoma present: +{TRS_POINTS['HCC']} points")
-            else:
-                component_scores["HCC"] = 0
-                details.append("Hepatocellular carcinoma absent: +0 points")
-        else:
-            warnings.append("HCC status missing")
-            
-        # CVVHD component (1 point if present)
-        if cvvhd is not None:
-            if cvvhd:
-                component_scores["CVVHD"] = TRS_POINTS["CVVHD"]
-                total_score += TRS_POINTS["CVVHD"]
-                details.append(f"Continuous veno-venous hemodialysis present: +{TRS_POINTS['CVVHD']} points")
-            else:
-                component_scores["CVVHD"] = 0
-                details.append("Continuous veno-venous hemodialysis absent: +0 points")
-        else:
-            warnings.append("CVVHD status missing")
-            
-        # VHF component (1 point if present)
-        if vhf is not None:
-            if vhf:
-                component_scores["VHF"] = TRS_POINTS["VHF"]
-                total_score += TRS_POINTS["VHF"]
-                details.append(f"Atrial fibrillation present: +{TRS_POINTS['VHF']} points")
-            else:
-                component_scores["VHF"] = 0
-                details.append("Atrial fibrillation absent: +0 points")
-        else:
-            warnings.append("Atrial fibrillation status missing")
+        for (cutpoint, compare, bit, warning), value in zip(_SCALAR_RULES, values):
+            if value is None:
+                warnings.append(warning)
+            elif compare(value, cutpoint):
+                hit_mask |= bit
+        component_scores = _COMPONENTS_FROM_MASK[hit_mask]
+        total_score = _SCORE_BY_MASK[hit_mask]
         
-        # Determine risk category
-        risk_category, risk_data = self._determine_risk_category(total_score)
+        # Identified patients always get the detail breakdown; anonymous calls
+        # only when logging, where the scorer wrapper (see _make_scorer) adds it
+        details = _build_details(values, component_scores) if patient_id is not None else []
         
-        # Check validity
-        valid = len(missing_components) <= 2  # Allow up to 2 missing components
-        if not valid:
-            warnings.append(f"Too many missing components ({len(missing_components)}). Results may be unreliable.")
+        # Determine risk category (mask-table totals always lie in 0..MAX_SCORE)
+        risk_category, risk_data = _CATEGORY_BY_SCORE[total_score]
         
-        if self.log_calculations:
-            logger.info(f"TRS calculation complete: Score={total_score}, Risk={risk_category}")
+        # Check validity (so far warnings holds one entry per missing component)
+        n_missing = len(warnings)
+        valid = n_missing <= 2  # Allow up to 2 missing components
+        if not valid:
+            warnings.append(f"Too many missing components ({n_missing}). Results may be unreliable.")
         
         return TRSResult(
             total_score=total_score,
@@ -261,124 +573,260 @@ class TRSCalculator:
         vhf: Optional[bool]
     ) -> None:
         """Validate input parameters."""
+        for (label, low, high), value in zip(_VALID_RANGES, (meld, saps_ii, age, platelets)):
+            if value is not None and not (low <= value <= high):
+                raise ValueError(f"{label} must be between {low} and {high}, got {value}")
+        
+        # Boolean variables don't need range validation
+    
+    def _validate_inputs_array(self, values: np.ndarray) -> None:
+        """Validate the continuous input columns of a whole cohort at once."""
+        out_of_range = _out_of_range(values)
+        if out_of_range.any():
+            column = int(out_of_range.any(axis=0).argmax())
+            label, low, high = _VALID_RANGES[column]
+            rows = np.flatnonzero(out_of_range[:, column]).tolist()
+            raise ValueError(f"{label} must be between {low} and {high}, out of range at rows {rows}")
+    
+    def calculate_scores_array(
+        self,
+        data: Mapping[str, Any],
+        out: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate TRS scores for a whole cohort using vectorized NumPy operations.
         
-        # Validate MELD
-        if meld is not None:
-            meld_range = VARIABLE_DEFINITIONS["MELD"]["range"]
-            if not (meld_range[0] <= meld <= meld_range[1]):
-                raise ValueError(f"MELD score must be between {meld_range[0]} and {meld_range[1]}, got {meld}")
+        This is the fast path for bootstrap loops and large cohorts: no
+        TRSResult objects, detail strings or timestamps are created.
+        Missing values (None/NaN) contribute 0 points, as in calculate_score.
         
-        # Validate SAPS II
-        if saps_ii is not None:
-            saps_range = VARIABLE_DEFINITIONS["SAPS_II"]["range"]
-            if not (saps_range[0] <= saps_ii <= saps_range[1]):
-                raise ValueError(f"SAPS II score must be between {saps_range[0]} and {saps_range[1]}, got {saps_ii}")
+        Each patient is also reduced to a uint8 hit mask (see COMPONENT_BITS),
+        so a bootstrap resample collapses to 128 pattern counts with
+        ``np.bincount(hit_mask[idx], minlength=128)``.
         
-        # Validate Age
-        if age is not None:
-            age_range = VARIABLE_DEFINITIONS["AGE"]["range"]
-            if not (age_range[0] <= age <= age_range[1]):
-                raise ValueError(f"Age must be between {age_range[0]} and {age_range[1]}, got {age}")
+        Args:
+            data: Mapping (dict of arrays or DataFrame) with columns meld, saps_ii,
+                age, platelets, hcc, cvvhd, vhf
+            out: Optional preallocated (N, 7) int8 buffer for the component scores,
+                reused across calls to avoid reallocation in bootstrap loops
+            
+        Returns:
+            Dict with component_scores (N x 7 int8 matrix in COMPONENT_ORDER),
+            total_score (N,), risk_category (N,), valid (N,) and hit_mask (N,) arrays
+            
+        Raises:
+            ValueError: If validate_inputs is enabled and any value is out of range
+        """
+        values = _input_matrix(data)
         
-        # Validate Platelets
-        if platelets is not None:
-            plt_range = VARIABLE_DEFINITIONS["PLATELETS"]["range"]
-            if not (plt_range[0] <= platelets <= plt_range[1]):
-                raise ValueError(f"Platelet count must be between {plt_range[0]} and {plt_range[1]}, got {platelets}")
+        if self.validate_inputs:
+            self._validate_inputs_array(values)
         
-        # Boolean variables don't need range validation
+        hit_mask = _score_kernel(values)
+        component_scores = np.take(_COMPONENTS_FROM_MASK, hit_mask, axis=0, out=out)
+        total_score = SCORE_FROM_MASK[hit_mask]
+        missing = np.isnan(values).sum(axis=1)
         
-    def _check_missing_data(
+        return {
+            "component_scores": component_scores,
+            "total_score": total_score,
+            "risk_category": _CATEGORY_LABELS[total_score],
+            "valid": missing <= 2,
+            "hit_mask": hit_mask,
+        }
+    
+    def calculate_batch(
         self,
-        meld: Optional[float],
-        saps_ii: Optional[float],
-        age: Optional[float],
-        platelets: Optional[float], 
-        hcc: Optional[bool],
-        cvvhd: Optional[bool],
-        vhf: Optional[bool]
-    ) -> List[str]:
-        """Check for missing data components."""
-        missing = []
+        patients_data: Union[List[Dict[str, Any]], Mapping[str, Any]],
+        workers: int = 1,
+        out: Optional[np.ndarray] = None,
+        return_scores_only: bool = False
+    ) -> Union[List[TRSResult], np.ndarray]:
+        """
+        Calculate TRS scores for multiple patients.
+        
+        A DataFrame (or mapping of columns) is scored by
+        calculate_batch_vectorized; a list of dictionaries is scored patient by
+        patient. For large cohorts where only the scores are needed, use
+        calculate_scores_array.
         
-        if meld is None:
-            missing.append("MELD")
-        if saps_ii is None:
-            missing.append("SAPS_II")
-        if age is None:
-            missing.append("AGE")
-        if platelets is None:
-            missing.append("PLATELETS")
-        if hcc is None:
-            missing.append("HCC")
-        if cvvhd is None:
-            missing.append("CVVHD")
-        if vhf is None:
-            missing.append("VHF")
+        Args:
+            patients_data: List of patient data dictionaries, or a DataFrame
+                (or mapping of NumPy arrays) with columns meld, saps_ii, age,
+                platelets, hcc, cvvhd, vhf
+            workers: Number of worker processes for a list of dictionaries. The
+                default of 1 runs serially; larger values spread patients over a
+                process pool, which only pays off for large cohorts. Scripts using
+                workers > 1 must guard their entry point with
+                ``if __name__ == "__main__"``. Ignored for DataFrame or column
+                input, which is scored in a single vectorized pass.
+            out: Optional preallocated (N,) int8 buffer for return_scores_only
+            return_scores_only: Return only the total scores as an int8 array
+                (-1 for patients failing validation, as in ERROR results)
+                instead of TRSResult objects
             
-        return missing
-    
-    def _determine_risk_category(self, score: int) -> Tuple[str, Dict[str, Any]]:
-        """Determine risk category based on TRS score."""
-        for category, data in RISK_CATEGORIES.items():
-            min_score, max_score = data["range"]
-            if min_score <= score <= max_score:
-                return category, data
+        Returns:
+            List[TRSResult] for all patients, or the score array if return_scores_only
+        """
+        if return_scores_only:
+            return self._batch_scores(patients_data, out)
+        if not isinstance(patients_data, (list, tuple)):
+            return self.calculate_batch_vectorized(patients_data)
         
-        # Fallback for scores outside defined ranges
-        if score < 0:
-            return "LOW", RISK_CATEGORIES["LOW"]
-        else:
-            return "HIGH", RISK_CATEGORIES["HIGH"]
+        indices = range(len(patients_data))
+        # One timestamp for the whole batch, shared by every result
+        timestamps = repeat(time.time_ns() if self.record_time else None)
+        
+        if workers == 1:
+            results: List[Optional[TRSResult]] = [None] * len(patients_data)
+            for i, patient_data, timestamp in zip(indices, patients_data, timestamps):
+                results[i] = self._calculate_patient(i, patient_data, timestamp)
+            return results
+        
+        chunksize = max(1, len(patients_data) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    self._calculate_patient, indices, patients_data, timestamps,
+                    chunksize=chunksize
+                )
+            )
     
-    def calculate_batch(self, patients_data: List[Dict[str, Any]]) -> List[TRSResult]:
+    def calculate_batch_vectorized(
+        self,
+        patients_data: Union[List[Dict[str, Any]], Mapping[str, Any]]
+    ) -> List[TRSResult]:
         """
-        Calculate TRS scores for multiple patients.
+        Calculate TRS results for a cohort in one vectorized scoring pass.
+        
+        Component points, missing-data warnings and validity are computed for
+        all patients at once and TRSResult objects are only built at the end;
+        per-patient calculations are not logged. Patients failing validation
+        get ERROR results, as in calculate_batch.
         
         Args:
-            patients_data: List of patient data dictionaries
+            patients_data: DataFrame or mapping of columns (meld, saps_ii, age,
+                platelets, hcc, cvvhd, vhf), or a list of patient dictionaries.
+                Missing values may be None or NaN.
             
         Returns:
-            List[TRSResult]: Results for all patients
+            List[TRSResult]: Results for all patients, sharing one timestamp
+            
+        Raises:
+            ValueError: If a column holds values that are not numeric
         """
-        results = []
+        from_dicts = isinstance(patients_data, (list, tuple))
+        columns = _batch_columns(patients_data)
+        values = _input_matrix(columns)
+        timestamp = time.time_ns() if self.record_time else None
+        
+        hit_mask = _score_kernel(values)
+        component_scores = _COMPONENTS_FROM_MASK[hit_mask]
+        total_scores = SCORE_FROM_MASK[hit_mask].tolist()
+        missing = np.isnan(values)
+        missing_mask = np.packbits(missing, axis=1, bitorder="little").reshape(-1).tolist()
+        n_missing = missing.sum(axis=1).tolist()
+        if self.validate_inputs:
+            rejected = _rejected_rows(values, columns, from_dicts).tolist()
+        else:
+            rejected = [False] * len(total_scores)
+        # Details as in calculate_score: when logging, or for identified patients
+        render_details = self.log_calculations or "patient_id" in columns
         
-        for i, patient_data in enumerate(patients_data):
-            patient_id = patient_data.get('patient_id', f'patient_{i+1}')
+        results: List[Optional[TRSResult]] = [None] * len(total_scores)
+        for i, total_score in enumerate(total_scores):
+            if rejected[i]:
+                if from_dicts:
+                    patient_data = patients_data[i]
+                else:
+                    patient_data = _column_row(columns, i, missing[i])
+                results[i] = self._calculate_patient(i, patient_data, timestamp)
+                continue
             
-            try:
-                result = self.calculate_score(
-                    meld=patient_data.get('meld'),
-                    saps_ii=patient_data.get('saps_ii'),
-                    age=patient_data.get('age'),
-                    platelets=patient_data.get('platelets'),
-                    hcc=patient_data.get('hcc'),
-                    cvvhd=patient_data.get('cvvhd'),
-                    vhf=patient_data.get('vhf'),
-                    patient_id=patient_id
-                )
-                results.append(result)
-                
-            except Exception as e:
-                logger.error(f"Error calculating TRS for {patient_id}: {e}")
-                # Create error result
-                error_result = TRSResult(
-                    total_score=-1,
-                    component_scores={},
-                    risk_category="ERROR",
-                    risk_description="Calculation Error",
-                    recommendation="Unable to calculate - check input data",
-                    mortality_risk=0.0,
-                    details=[f"Error: {str(e)}"],
-                    timestamp=datetime.now(),
-                    valid=False,
-                    warnings=[f"Calculation failed: {str(e)}"]
+            risk_category, risk_data = _CATEGORY_BY_SCORE[total_score]
+            warnings = list(_WARNINGS_FROM_MISSING_MASK[missing_mask[i]])
+            valid = n_missing[i] <= 2
+            if not valid:
+                warnings.append(f"Too many missing components ({n_missing[i]}). Results may be unreliable.")
+            details = []
+            if render_details:
+                details = _build_details(
+                    tuple(None if is_missing else value
+                          for value, is_missing in zip(values[i].tolist(), missing[i])),
+                    component_scores[i]
                 )
-                results.append(error_result)
+            
+            results[i] = TRSResult(
+                total_score=total_score,
+                component_scores=component_scores[i],
+                risk_category=risk_category,
+                risk_description=risk_data["description"],
+                recommendation=risk_data["recommendation"],
+                mortality_risk=risk_data["mortality_rate"],
+                details=details,
+                timestamp=timestamp,
+                valid=valid,
+                warnings=warnings
+            )
         
+        if self.log_calculations:
+            logger.info("TRS batch calculation complete: %d patients", len(results))
         return results
     
-    def get_component_info(self, component: str) -> Dict[str, Any]:
+    def _batch_scores(
+        self,
+        patients_data: Union[List[Dict[str, Any]], Mapping[str, Any]],
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Total scores for batch input, without building TRSResults."""
+        columns = _batch_columns(patients_data)
+        values = _input_matrix(columns)
+        if out is None:
+            out = np.empty(values.shape[0], dtype=np.int8)
+        np.take(SCORE_FROM_MASK, _score_kernel(values), out=out)
+        if self.validate_inputs:
+            out[_rejected_rows(values, columns, isinstance(patients_data, (list, tuple)))] = -1
+        return out
+    
+    def _calculate_patient(
+        self,
+        index: int,
+        patient_data: Dict[str, Any],
+        timestamp: Optional[int] = None
+    ) -> TRSResult:
+        """Calculate one batch entry, converting failures into an ERROR result."""
+        patient_id = patient_data.get('patient_id', f'patient_{index+1}')
+        
+        try:
+            return self.calculate_score(
+                meld=patient_data.get('meld'),
+                saps_ii=patient_data.get('saps_ii'),
+                age=patient_data.get('age'),
+                platelets=patient_data.get('platelets'),
+                hcc=patient_data.get('hcc'),
+                cvvhd=patient_data.get('cvvhd'),
+                vhf=patient_data.get('vhf'),
+                patient_id=patient_id,
+                timestamp=timestamp
+            )
+            
+        except Exception as e:
+            logger.error("Error calculating TRS for %s: %s", patient_id, e)
+            # Create error result
+            return TRSResult(
+                total_score=-1,
+                component_scores=np.zeros(len(COMPONENT_ORDER), dtype=np.int8),
+                risk_category="ERROR",
+                risk_description="Calculation Error",
+                recommendation="Unable to calculate - check input data",
+                mortality_risk=0.0,
+                details=[f"Error: {str(e)}"],
+                timestamp=timestamp,
+                valid=False,
+                warnings=[f"Calculation failed: {str(e)}"]
+            )
+    
+    def get_component_info(self, component: str) -> ComponentInfo:
         """
         Get detailed information about a TRS component.
         
@@ -386,28 +834,46 @@ class TRSCalculator:
             component: Component name (MELD, SAPS_II, AGE, PLATELETS, HCC, CVVHD, VHF)
             
         Returns:
-            Dict with component information
+            ComponentInfo: Shared read-only component information
             
         Raises:
             ValueError: If component is not recognized
         """
-        if component not in VARIABLE_DEFINITIONS:
-            raise ValueError(f"Unknown component: {component}")
-        
-        info = VARIABLE_DEFINITIONS[component].copy()
-        
-        if component in TRS_CUTPOINTS:
-            info["cutpoint"] = TRS_CUTPOINTS[component]
-        
-        if component in TRS_POINTS:
-            info["points"] = TRS_POINTS[component]
-        
-        return info
+        try:
+            return _COMPONENT_INFO[component]
+        except KeyError:
+            raise ValueError(f"Unknown component: {component}") from None
     
-    def get_all_components_info(self) -> Dict[str, Dict[str, Any]]:
+    def get_all_components_info(self) -> Dict[str, ComponentInfo]:
         """Get information about all TRS components."""
-        return {
-            component: self.get_component_info(component)
-            for component in VARIABLE_DEFINITIONS.keys()
-        }
+        return dict(_COMPONENT_INFO)
+
+
+# Per-thread calculator cache, so repeated module-level calls reuse instances
+_thread_state = threading.local()
+
+
+def default_calculator(
+    validate_inputs: bool = True,
+    log_calculations: bool = True
+) -> TRSCalculator:
+    """
+    Get the shared TRSCalculator for the current thread.
+    
+    One instance is kept per thread and flag combination; treat it as
+    read-only and construct a TRSCalculator for custom settings.
+    """
+    factory = getattr(_thread_state, "factory", None)
+    if factory is None:
+        factory = _thread_state.factory = functools.lru_cache(maxsize=None)(TRSCalculator)
+    return factory(validate_inputs, log_calculations)
+
+
+def calculate_score(*args: Any, **kwargs: Any) -> TRSResult:
+    """Calculate a TRS score with the default calculator (see TRSCalculator.calculate_score)."""
+    return default_calculator().calculate_score(*args, **kwargs)
+
 
+def calculate_batch(*args: Any, **kwargs: Any) -> Union[List[TRSResult], np.ndarray]:
+    """Calculate TRS scores with the default calculator (see TRSCalculator.calculate_batch)."""
+    return default_calculator().calculate_batch(*args, **kwargs)
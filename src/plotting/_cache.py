@@ -0,0 +1,86 @@
+"""
+Caching helpers shared by the plotting scripts.
+
+The synthetic data generators are deterministic in their (small integer)
+arguments, so their outputs can be reused across panels and re-runs.
+Figure grids are likewise kept and cleared instead of being rebuilt when a
+figure is regenerated in the same session (notebook/REPL).
+
+Each panel draws from its own child of one SeedSequence, so panels never
+share a seed by accident.
+"""
+
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+# Root seed of all synthetic plot data
+SEED = 42
+
+# Open figures by (nrows, ncols, figsize, subplots kwargs)
+_FIG_CACHE = {}
+
+
+def panel_rng(stream):
+    """Independent Generator for a panel: child `stream` of SeedSequence(SEED).spawn()."""
+    return np.random.default_rng(np.random.SeedSequence(SEED, spawn_key=(stream,)))
+
+
+def cached_data(maxsize=64):
+    """
+    Memoize a data generator whose result is a tuple of arrays and scalars.
+    
+    Returned arrays are marked read-only, since every caller shares them.
+    """
+    def decorator(generate):
+        @functools.lru_cache(maxsize=maxsize)
+        @functools.wraps(generate)
+        def wrapper(*args, **kwargs):
+            result = generate(*args, **kwargs)
+            for value in result:
+                if isinstance(value, np.ndarray):
+                    value.flags.writeable = False
+            return result
+        return wrapper
+    return decorator
+
+
+def _call(generate, kwargs):
+    return generate(**kwargs)
+
+
+def generate_panels(generate, panel_kwargs, workers=1):
+    """
+    Generate the data of several panels, one generate(**kwargs) call per panel.
+    
+    The default of workers=1 runs serially; larger values spread the panels
+    over a process pool. Plotting itself must stay in the calling process.
+    """
+    if workers == 1:
+        return [generate(**kwargs) for kwargs in panel_kwargs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_call, repeat(generate), panel_kwargs))
+
+
+def cached_subplots(nrows, ncols, figsize, **kwargs):
+    """
+    plt.subplots() that reuses the previous figure of the same layout.
+    
+    A reused figure has its axes cleared and its figure-level texts removed;
+    a figure that has been closed since is created afresh.
+    """
+    key = (nrows, ncols, figsize, tuple(sorted(kwargs.items())))
+    cached = _FIG_CACHE.get(key)
+    if cached is not None and plt.fignum_exists(cached[0].number):
+        fig, axes = cached
+        for ax in np.ravel(axes):
+            ax.cla()
+        for text in list(fig.texts):
+            text.remove()
+        return fig, axes
+    
+    _FIG_CACHE[key] = plt.subplots(nrows, ncols, figsize=figsize, **kwargs)
+    return _FIG_CACHE[key]
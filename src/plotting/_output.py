@@ -0,0 +1,42 @@
+"""
+Figure output helpers shared by the plotting scripts.
+
+Scripts save PNG at 300 DPI by default; ``--fmt svg`` or ``--fmt pdf`` on
+the command line writes a vector file with the same name instead.
+"""
+
+import sys
+
+VECTOR_FORMATS = ('svg', 'pdf')
+
+
+def output_format(argv=None):
+    """Return the --fmt value from the command line (default 'png')."""
+    argv = sys.argv[1:] if argv is None else argv
+    for i, arg in enumerate(argv):
+        if arg == '--fmt' and i + 1 < len(argv):
+            return argv[i + 1].lower()
+        if arg.startswith('--fmt='):
+            return arg.split('=', 1)[1].lower()
+    return 'png'
+
+
+def save_figure(fig, output_path, fmt=None):
+    """
+    Save a figure in the requested format
+    
+    Args:
+        fig: Figure to save
+        output_path: Target path; its suffix is replaced by the format
+        fmt: 'png', 'svg' or 'pdf' (default: --fmt from the command line)
+    
+    Returns:
+        Path the figure was written to
+    """
+    fmt = fmt or output_format()
+    output_path = output_path.with_suffix(f".{fmt}")
+    if fmt in VECTOR_FORMATS:
+        fig.savefig(output_path, facecolor='white')
+    else:
+        fig.savefig(output_path, dpi=300, facecolor='white')
+    return output_path
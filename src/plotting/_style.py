@@ -0,0 +1,21 @@
+"""
+Matplotlib style shared by the plotting scripts.
+
+Reproduces plt.style.use('seaborn-v0_8') + sns.set_palette("husl") without
+importing seaborn: the style sheet ships with matplotlib and the palette is
+seaborn's default 6-color husl palette.
+"""
+
+import matplotlib.pyplot as plt
+
+# sns.color_palette("husl") as hex
+HUSL_PALETTE = ['#f77189', '#bb9832', '#50b131', '#36ada4', '#3ba3ec', '#e866f4']
+
+# Box behind per-panel annotation text (matplotlib copies it, so it can be shared)
+TEXT_BOX = dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8)
+
+
+def apply_style():
+    """Apply the seaborn-v0_8 style with the husl color cycle."""
+    plt.style.use('seaborn-v0_8')
+    plt.rcParams['axes.prop_cycle'] = plt.cycler(color=HUSL_PALETTE)
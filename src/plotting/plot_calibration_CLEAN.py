@@ -9,17 +9,32 @@ CLEAN Calibration Plots for TRS Model - NO OVERLAPS!
 5. Больше figsize (12x8 для 2x3)
 """
 
+import sys
+
 import numpy as np
+import matplotlib
+
+# Headless Agg backend for batch PNG generation; pass --show for a GUI window
+if __name__ == "__main__" and "--show" not in sys.argv:
+    matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.calibration import calibration_curve
 from pathlib import Path
 
+try:
+    from ._cache import cached_data, cached_subplots, generate_panels, panel_rng
+    from ._output import save_figure
+    from ._style import TEXT_BOX, apply_style
+except ImportError:  # run as a script from src/plotting
+    from _cache import cached_data, cached_subplots, generate_panels, panel_rng
+    from _output import save_figure
+    from _style import TEXT_BOX, apply_style
+
 # Set style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+apply_style()
 
-def generate_calibration_data(landmark_day, time_horizon, n_patients=147):
+@cached_data()
+def generate_calibration_data(landmark_day, time_horizon, n_patients=147, stream=0):
     """
     Generate synthetic calibration data for landmark/horizon combination
     
@@ -27,53 +42,74 @@ def generate_calibration_data(landmark_day, time_horizon, n_patients=147):
         landmark_day: Day 3, 5, or 7
         time_horizon: 30, 60, or 90 days
         n_patients: Number of patients
+        stream: Random stream (panel index) to draw from
     
     Returns:
         y_true, y_prob, slope, intercept
     """
-    np.random.seed(42 + landmark_day + time_horizon)
+    rng = panel_rng(stream)
     
     # Generate TRS scores (0-8 range)
-    trs_scores = np.random.choice(range(9), n_patients, 
-                                 p=[0.15, 0.20, 0.25, 0.20, 0.10, 0.05, 0.03, 0.01, 0.01])
+    trs_scores = rng.choice(9, n_patients, 
+                          p=[0.15, 0.20, 0.25, 0.20, 0.10, 0.05, 0.03, 0.01, 0.01])
     
     # Convert to probabilities (sigmoid-like transformation)
     y_prob = 1 / (1 + np.exp(-(trs_scores - 4) * 0.8))
     
     # Add some noise based on landmark day and time horizon
     noise_factor = 0.1 + 0.05 * (landmark_day - 3) / 4 + 0.05 * (time_horizon - 30) / 60
-    y_prob += np.random.normal(0, noise_factor, n_patients)
+    y_prob += rng.standard_normal(n_patients) * noise_factor
     y_prob = np.clip(y_prob, 0.01, 0.99)
     
     # Generate true outcomes based on probabilities with some calibration error
     calibration_bias = 0.1 * np.sin(landmark_day + time_horizon / 30)
     adjusted_prob = np.clip(y_prob + calibration_bias, 0.01, 0.99)
-    y_true = np.random.binomial(1, adjusted_prob, n_patients)
-    
-    # Calculate calibration metrics
-    fraction_of_positives, mean_predicted_value = calibration_curve(
-        y_true, y_prob, n_bins=5, strategy='quantile'
+    y_true = rng.binomial(1, adjusted_prob)
+    
+    # Calculate calibration metrics (5 quantile bins, as calibration_curve)
+    bin_edges = np.quantile(y_prob, np.linspace(0, 1, 6))
+    bin_ids = np.searchsorted(bin_edges[1:-1], y_prob)
+    bin_total = np.bincount(bin_ids, minlength=5)
+    nonempty = bin_total > 0
+    fraction_of_positives = (
+        np.bincount(bin_ids, weights=y_true, minlength=5)[nonempty] / bin_total[nonempty]
+    )
+    mean_predicted_value = (
+        np.bincount(bin_ids, weights=y_prob, minlength=5)[nonempty] / bin_total[nonempty]
     )
     
     # Calculate slope and intercept for calibration line
     if len(mean_predicted_value) > 1:
-        slope = np.polyfit(mean_predicted_value, fraction_of_positives, 1)[0]
-        intercept = np.polyfit(mean_predicted_value, fraction_of_positives, 1)[1]
+        # Closed-form least squares fit of observed on predicted
+        x_centered = mean_predicted_value - mean_predicted_value.mean()
+        y_centered = fraction_of_positives - fraction_of_positives.mean()
+        slope = (x_centered * y_centered).sum() / (x_centered ** 2).sum()
+        intercept = fraction_of_positives.mean() - slope * mean_predicted_value.mean()
     else:
         slope, intercept = 1.0, 0.0
     
     return y_true, y_prob, fraction_of_positives, mean_predicted_value, slope, intercept
 
-def create_clean_calibration_plots():
-    """Create CLEAN calibration plots with NO overlaps"""
+def create_clean_calibration_plots(workers=1):
+    """Create CLEAN calibration plots with NO overlaps
+    
+    Args:
+        workers: Processes used to generate the panel data (1 = serial)
+    """
     
     # 2x3 layout for 6 landmark/horizon combinations
-    fig, axes = plt.subplots(2, 3, figsize=(12, 8), sharex=True, sharey=True)
+    fig, axes = cached_subplots(2, 3, figsize=(12, 8), sharex=True, sharey=True)
     
     # ДРАСТИЧЕСКИЕ ИЗМЕНЕНИЯ: такие же как для ROC matrix
     fig.subplots_adjust(top=0.85, hspace=0.4, wspace=0.3, 
                        bottom=0.12, left=0.08, right=0.95)
     
+    # Shared axes configuration, applied once for the whole grid
+    plt.setp(axes, xlim=(0, 1), ylim=(0, 1))
+    for ax in axes.flat:
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(which='minor', length=0)
+    
     # Маленький suptitle, низко позиционированный
     fig.suptitle("Supplementary Figure S1. Calibration Plots for TRS at Different Landmark Time Points",
                  fontsize=11, fontweight='bold', y=0.92)
@@ -82,16 +118,21 @@ def create_clean_calibration_plots():
     landmark_days = [3, 5, 7]
     time_horizons = [30, 60]  # Only 30 and 60 days for 2x3 layout
     
+    # Generate data for all panels, then plot in this process
+    panel_data = generate_panels(generate_calibration_data, [
+        dict(landmark_day=landmark_day, time_horizon=time_horizon,
+             stream=i * len(landmark_days) + j)
+        for i, time_horizon in enumerate(time_horizons)
+        for j, landmark_day in enumerate(landmark_days)
+    ], workers)
+    
     # Plot each combination
     plot_idx = 0
     for i, time_horizon in enumerate(time_horizons):
         for j, landmark_day in enumerate(landmark_days):
             ax = axes[i, j]
             
-            # Generate calibration data
-            y_true, y_prob, frac_pos, mean_pred, slope, intercept = generate_calibration_data(
-                landmark_day, time_horizon
-            )
+            y_true, y_prob, frac_pos, mean_pred, slope, intercept = panel_data[plot_idx]
             
             # Plot perfect calibration line
             ax.plot([0, 1], [0, 1], 'k--', alpha=0.7, linewidth=1.5, 
@@ -107,7 +148,7 @@ def create_clean_calibration_plots():
                 frac_lower = np.clip(frac_pos - ci_width, 0, 1)
                 frac_upper = np.clip(frac_pos + ci_width, 0, 1)
                 ax.fill_between(mean_pred, frac_lower, frac_upper, 
-                               alpha=0.3, color='red')
+                               alpha=0.3, color='red', rasterized=True)
             
             # МАЛЕНЬКИЕ subplot titles с padding
             title = f"Day {landmark_day}, {time_horizon} days\nSlope: {slope:.3f}, Intercept: {intercept:.3f}"
@@ -116,13 +157,9 @@ def create_clean_calibration_plots():
             # Add sample size
             n_patients = 147 - landmark_day * 5 - time_horizon // 30 * 10
             ax.text(0.02, 0.98, f"n = {n_patients}", transform=ax.transAxes,
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8),
+                   bbox=TEXT_BOX,
                    fontsize=8, verticalalignment='top')
             
-            ax.set_xlim([0, 1])
-            ax.set_ylim([0, 1])
-            ax.grid(True, alpha=0.3)
-            
             # Add legend only to first subplot
             if i == 0 and j == 0:
                 ax.legend(fontsize=8, loc='lower right')
@@ -141,9 +178,8 @@ if __name__ == "__main__":
     # Create CLEAN calibration plots
     fig = create_clean_calibration_plots()
     
-    # Save to figures directory with high DPI
-    output_path = Path("figures/figure_S1_calibration_CLEAN.png")
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    # Save to figures directory (300 DPI PNG unless --fmt svg/pdf)
+    output_path = save_figure(fig, Path("figures/figure_S1_calibration_CLEAN.png"))
     
     print(f"✅ CLEAN calibration plots saved to: {output_path}")
     print("🔧 CLEAN version features:")
@@ -154,5 +190,6 @@ if __name__ == "__main__":
     print("   5. Figure size optimized to (12, 8) for 2x3 layout")
     print("   6. NO overlaps anywhere!")
     
-    plt.show()
+    if "--show" in sys.argv:
+        plt.show()
 
@@ -7,41 +7,54 @@ Fixes:
 3. Added Y-axis label "Net Benefit (patients per 100)"
 """
 
+import sys
+
 import numpy as np
+import matplotlib
+
+# Headless Agg backend for batch PNG generation; pass --show for a GUI window
+if __name__ == "__main__" and "--show" not in sys.argv:
+    matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 
+try:
+    from ._output import save_figure
+    from ._style import apply_style
+except ImportError:  # run as a script from src/plotting
+    from _output import save_figure
+    from _style import apply_style
+
 # Set style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+apply_style()
 
 def calculate_net_benefit(threshold, prevalence=0.39, sensitivity=1.0, specificity=0.474):
     """
     Calculate net benefit for decision curve analysis
     
     Args:
-        threshold: Threshold probability
+        threshold: Threshold probability, or an array of thresholds
         prevalence: Disease prevalence (39% mortality in our cohort)
         sensitivity: Model sensitivity (100% for TRS ≥3)
         specificity: Model specificity (47.4% for TRS ≥3)
     
     Returns:
-        Net benefit value (can be negative)
+        Net benefit value (can be negative), as an array for array input
     """
-    if threshold == 0:
-        return prevalence
-    if threshold == 1:
-        return 0
+    threshold = np.asarray(threshold, dtype=float)
     
     # True positives and false positives per 100 patients
     tp = prevalence * sensitivity * 100
     fp = (1 - prevalence) * (1 - specificity) * 100
     
     # Net benefit = (TP - FP * (threshold/(1-threshold))) / 100
-    net_benefit = (tp - fp * (threshold / (1 - threshold))) / 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        net_benefit = (tp - fp * (threshold / (1 - threshold))) / 100
+    net_benefit = np.where(threshold == 0, prevalence,
+                           np.where(threshold == 1, 0.0, net_benefit))
     
-    return net_benefit
+    return net_benefit if net_benefit.ndim else float(net_benefit)
 
 def create_corrected_dca_plot():
     """Create corrected Decision Curve Analysis plot"""
@@ -49,23 +62,16 @@ def create_corrected_dca_plot():
     # Create threshold range
     thresholds = np.linspace(0.01, 0.99, 100)
     
-    # Calculate net benefits
-    trs_benefits = []
-    treat_all_benefits = []
-    treat_none_benefits = []
-    
-    for threshold in thresholds:
-        # TRS Model net benefit
-        trs_nb = calculate_net_benefit(threshold, prevalence=0.39, 
-                                     sensitivity=1.0, specificity=0.474)
-        trs_benefits.append(trs_nb)
-        
-        # Treat All strategy (no clipping - can go negative!)
-        treat_all_nb = 0.39 - (1 - 0.39) * (threshold / (1 - threshold))
-        treat_all_benefits.append(treat_all_nb)
-        
-        # Treat None strategy (always 0)
-        treat_none_benefits.append(0.0)
+    # Calculate net benefits over all thresholds at once
+    trs_benefits = calculate_net_benefit(thresholds, prevalence=0.39,
+                                         sensitivity=1.0, specificity=0.474)
+    
+    # Treat All strategy: everyone is treated (no clipping - can go negative!)
+    treat_all_benefits = calculate_net_benefit(thresholds, prevalence=0.39,
+                                               sensitivity=1.0, specificity=0.0)
+    
+    # Treat None strategy (always 0)
+    treat_none_benefits = np.zeros_like(thresholds)
     
     # Create the plot
     fig, ax = plt.subplots(figsize=(12, 8))
@@ -106,9 +112,8 @@ if __name__ == "__main__":
     # Create corrected plot
     fig = create_corrected_dca_plot()
     
-    # Save to figures directory with high DPI
-    output_path = Path("figures/dca_corrected.png")
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    # Save to figures directory (300 DPI PNG unless --fmt svg/pdf)
+    output_path = save_figure(fig, Path("figures/dca_corrected.png"))
     
     print(f"✅ Corrected Decision Curve Analysis saved to: {output_path}")
     print("🔧 Fixes applied:")
@@ -116,5 +121,6 @@ if __name__ == "__main__":
     print("   2. Updated annotation to '10-55%'")
     print("   3. Added Y-axis label 'Net Benefit (patients per 100)'")
     
-    plt.show()
+    if "--show" in sys.argv:
+        plt.show()
 
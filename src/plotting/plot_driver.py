@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Render any or all TRS figures from a single process
+
+Usage:
+    python src/plotting/plot_driver.py [kind ...] [--fmt svg|pdf] [--show]
+
+Kinds: calibration, dca, km, roc_matrix, time_roc (default: all five).
+The style, data caches and figure cache are shared across the figures,
+so rendering them together pays the import and setup cost once.
+"""
+
+import sys
+
+import matplotlib
+
+# Headless Agg backend for batch PNG generation; pass --show for a GUI window
+if __name__ == "__main__" and "--show" not in sys.argv:
+    matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from pathlib import Path
+
+try:
+    from ._output import save_figure
+    from . import (
+        plot_calibration_CLEAN, plot_dca_corrected, plot_km_corrected,
+        plot_roc_matrix_CLEAN, plot_time_roc_corrected,
+    )
+except ImportError:  # run as a script from src/plotting
+    from _output import save_figure
+    import plot_calibration_CLEAN
+    import plot_dca_corrected
+    import plot_km_corrected
+    import plot_roc_matrix_CLEAN
+    import plot_time_roc_corrected
+
+# kind -> (create function, default output path)
+FIGURES = {
+    'calibration': (plot_calibration_CLEAN.create_clean_calibration_plots,
+                    "figures/figure_S1_calibration_CLEAN.png"),
+    'dca': (plot_dca_corrected.create_corrected_dca_plot,
+            "figures/dca_corrected.png"),
+    'km': (plot_km_corrected.create_corrected_km_plot,
+           "figures/figure_S2_km_corrected.png"),
+    'roc_matrix': (plot_roc_matrix_CLEAN.create_clean_roc_matrix,
+                   "figures/figure_S3_roc_CLEAN.png"),
+    'time_roc': (plot_time_roc_corrected.create_corrected_roc_plot,
+                 "figures/time_roc_corrected.png"),
+}
+
+def plot(kind, **kwargs):
+    """
+    Create one figure
+    
+    Args:
+        kind: Figure kind (a key of FIGURES)
+        **kwargs: Passed to the figure's create function (e.g. workers)
+    
+    Returns:
+        The matplotlib Figure
+    """
+    if kind not in FIGURES:
+        raise ValueError(f"Unknown figure kind: {kind} (expected one of {', '.join(FIGURES)})")
+    create, _ = FIGURES[kind]
+    return create(**kwargs)
+
+def render(kinds=None, fmt=None):
+    """
+    Create and save several figures
+    
+    Args:
+        kinds: Figure kinds to render (default: all)
+        fmt: Output format, see save_figure (default: --fmt or png)
+    
+    Returns:
+        List of written paths
+    """
+    output_paths = []
+    for kind in kinds or FIGURES:
+        fig = plot(kind)
+        output_paths.append(save_figure(fig, Path(FIGURES[kind][1]), fmt))
+    return output_paths
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    kinds = [
+        arg for i, arg in enumerate(args)
+        if not arg.startswith('--') and (i == 0 or args[i - 1] != '--fmt')
+    ]
+    
+    for output_path in render(kinds):
+        print(f"✅ Saved: {output_path}")
+    
+    if "--show" in sys.argv:
+        plt.show()
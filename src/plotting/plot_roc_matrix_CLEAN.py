@@ -7,17 +7,35 @@ Final version:
 - Clean and professional appearance
 """
 
+import sys
+
 import numpy as np
+import matplotlib
+
+# Headless Agg backend for batch PNG generation; pass --show for a GUI window
+if __name__ == "__main__" and "--show" not in sys.argv:
+    matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
-import seaborn as sns
+from matplotlib.collections import PolyCollection
 from sklearn.metrics import roc_curve, auc
+from scipy.stats import norm
 from pathlib import Path
 
+try:
+    from ._cache import cached_data, cached_subplots, generate_panels, panel_rng
+    from ._output import save_figure
+    from ._style import TEXT_BOX, apply_style
+except ImportError:  # run as a script from src/plotting
+    from _cache import cached_data, cached_subplots, generate_panels, panel_rng
+    from _output import save_figure
+    from _style import TEXT_BOX, apply_style
+
 # Set style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+apply_style()
 
-def generate_roc_data(landmark_day, time_horizon, n_patients=147):
+@cached_data()
+def generate_roc_data(landmark_day, time_horizon, n_patients=147, stream=0):
     """
     Generate synthetic ROC data for landmark/horizon combination
     
@@ -25,11 +43,12 @@ def generate_roc_data(landmark_day, time_horizon, n_patients=147):
         landmark_day: Day 3, 5, or 7
         time_horizon: 30, 60, or 90 days
         n_patients: Number of patients
+        stream: Random stream (panel index) to draw from
     
     Returns:
         y_true, y_scores, auc_value, sensitivity, specificity, youden_index
     """
-    np.random.seed(42 + landmark_day + time_horizon)
+    rng = panel_rng(stream)
     
     # Performance varies by landmark day and time horizon
     base_auc = 0.5 + 0.1 * (landmark_day / 7) + 0.05 * (90 - time_horizon) / 60
@@ -41,21 +60,13 @@ def generate_roc_data(landmark_day, time_horizon, n_patients=147):
     
     y_true = np.zeros(n_patients)
     y_true[:n_events] = 1
-    np.random.shuffle(y_true)
-    
-    # Generate scores to achieve target AUC
-    y_scores = np.random.beta(2, 5, n_patients)
-    
-    # Iterative adjustment to achieve target AUC
-    for _ in range(50):
-        current_auc = auc(*roc_curve(y_true, y_scores)[:2])
-        if abs(current_auc - base_auc) < 0.01:
-            break
-        
-        adjustment = (base_auc - current_auc) * 0.1
-        y_scores[y_true == 1] += adjustment
-        y_scores[y_true == 0] -= adjustment
-        y_scores = np.clip(y_scores, 0, 1)
+    rng.shuffle(y_true)
+    
+    # Bi-normal model: unit-variance classes separated by sqrt(2)*ppf(AUC)
+    # have the target AUC in expectation; norm.cdf maps scores into (0, 1)
+    latent = rng.standard_normal(n_patients)
+    latent[y_true == 1] += np.sqrt(2) * norm.ppf(base_auc)
+    y_scores = norm.cdf(latent)
     
     # Calculate final metrics
     fpr, tpr, thresholds = roc_curve(y_true, y_scores)
@@ -71,16 +82,26 @@ def generate_roc_data(landmark_day, time_horizon, n_patients=147):
     
     return y_true, y_scores, final_auc, sensitivity, specificity, youden_index
 
-def create_clean_roc_matrix():
-    """Create CLEAN 3×3 ROC matrix plot with only red border, no text"""
+def create_clean_roc_matrix(workers=1):
+    """Create CLEAN 3×3 ROC matrix plot with only red border, no text
+    
+    Args:
+        workers: Processes used to generate the panel data (1 = serial)
+    """
     
     # Perfect spacing from previous version
-    fig, axes = plt.subplots(3, 3, figsize=(12, 12), sharex=True, sharey=True)
+    fig, axes = cached_subplots(3, 3, figsize=(12, 12), sharex=True, sharey=True)
     
     # Perfect spacing that works
     fig.subplots_adjust(top=0.85, hspace=0.4, wspace=0.3, 
                        bottom=0.08, left=0.08, right=0.95)
     
+    # Shared axes configuration, applied once for the whole grid
+    plt.setp(axes, xlim=(0, 1), ylim=(0, 1))
+    for ax in axes.flat:
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(which='minor', length=0)
+    
     # Clean suptitle
     fig.suptitle("Supplementary Figure S3. Time-dependent ROC for all landmark / horizon pairs",
                  fontsize=11, fontweight='bold', y=0.92)
@@ -89,15 +110,22 @@ def create_clean_roc_matrix():
     landmark_days = [3, 5, 7]
     time_horizons = [30, 60, 90]
     
+    # Generate data for all panels, then plot in this process
+    panel_data = generate_panels(generate_roc_data, [
+        dict(landmark_day=landmark_day, time_horizon=time_horizon,
+             stream=i * len(time_horizons) + j)
+        for i, landmark_day in enumerate(landmark_days)
+        for j, time_horizon in enumerate(time_horizons)
+    ], workers)
+    
     # Plot each combination
     for i, landmark_day in enumerate(landmark_days):
         for j, time_horizon in enumerate(time_horizons):
             ax = axes[i, j]
             
-            # Generate data
-            y_true, y_scores, auc_val, sens, spec, youden = generate_roc_data(
-                landmark_day, time_horizon
-            )
+            y_true, y_scores, auc_val, sens, spec, youden = panel_data[
+                i * len(time_horizons) + j
+            ]
             
             # Calculate ROC curve
             fpr, tpr, thresholds = roc_curve(y_true, y_scores)
@@ -110,7 +138,10 @@ def create_clean_roc_matrix():
             ci_width = 0.05
             tpr_lower = np.clip(tpr - ci_width, 0, 1)
             tpr_upper = np.clip(tpr + ci_width, 0, 1)
-            ax.fill_between(fpr, tpr_lower, tpr_upper, alpha=0.2, color='blue')
+            band = np.concatenate([np.column_stack([fpr, tpr_upper]),
+                                   np.column_stack([fpr[::-1], tpr_lower[::-1]])])
+            ax.add_collection(PolyCollection([band], alpha=0.2, color='blue',
+                                             rasterized=True))
             
             # Plot diagonal reference line
             ax.plot([0, 1], [0, 1], 'k--', alpha=0.5, linewidth=1, label='Random classifier')
@@ -124,21 +155,16 @@ def create_clean_roc_matrix():
             title = f"Day {landmark_day}, {time_horizon} days\nn = {147 - landmark_day * 5}"
             ax.set_title(title, fontsize=9, fontweight='bold', pad=8)
             
-            ax.set_xlim([0, 1])
-            ax.set_ylim([0, 1])
-            ax.grid(True, alpha=0.3)
-            
             # Add performance metrics in text box
             metrics_text = f"Sensitivity: {sens:.3f}\nSpecificity: {spec:.3f}\nYouden Index: {youden:.3f}"
             ax.text(0.02, 0.98, metrics_text, transform=ax.transAxes,
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8),
+                   bbox=TEXT_BOX,
                    fontsize=7, verticalalignment='top')
             
             # ONLY red border for optimal model (Day 7, 60 days) - NO TEXT!
             if landmark_day == 7 and time_horizon == 60:
-                for spine in ax.spines.values():
-                    spine.set_edgecolor('red')
-                    spine.set_linewidth(2.0)  # Slightly thicker for visibility
+                # Slightly thicker for visibility
+                plt.setp(ax.spines.values(), edgecolor='red', linewidth=2.0)
                 
                 # NO "OPTIMAL MODEL" text - will be described in paper!
     
@@ -154,9 +180,8 @@ if __name__ == "__main__":
     # Create CLEAN plot
     fig = create_clean_roc_matrix()
     
-    # Save to figures directory with high DPI
-    output_path = Path("figures/figure_S3_roc_CLEAN.png")
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    # Save to figures directory (300 DPI PNG unless --fmt svg/pdf)
+    output_path = save_figure(fig, Path("figures/figure_S3_roc_CLEAN.png"))
     
     print(f"✅ CLEAN 3×3 ROC matrix saved to: {output_path}")
     print("🔧 CLEAN version features:")
@@ -166,5 +191,6 @@ if __name__ == "__main__":
     print("   4. Clean professional appearance")
     print("   5. Optimal model will be described in paper text")
     
-    plt.show()
+    if "--show" in sys.argv:
+        plt.show()
 
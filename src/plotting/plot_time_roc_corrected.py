@@ -7,29 +7,46 @@ Fixes:
 3. Improved visual appearance
 """
 
+import sys
+
 import numpy as np
+import matplotlib
+
+# Headless Agg backend for batch PNG generation; pass --show for a GUI window
+if __name__ == "__main__" and "--show" not in sys.argv:
+    matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.metrics import roc_curve, auc
-from scipy.spatial import ConvexHull
+from scipy.stats import norm
 from pathlib import Path
 
+try:
+    from ._cache import cached_data, panel_rng
+    from ._output import save_figure
+    from ._style import apply_style
+except ImportError:  # run as a script from src/plotting
+    from _cache import cached_data, panel_rng
+    from _output import save_figure
+    from _style import apply_style
+
 # Set style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+apply_style()
 
-def generate_synthetic_roc_data(landmark_day, n_patients=147):
+@cached_data()
+def generate_synthetic_roc_data(landmark_day, n_patients=147, stream=0):
     """
     Generate synthetic ROC data based on our TRS performance
     
     Args:
         landmark_day: Day 3, 5, or 7
         n_patients: Number of patients
+        stream: Random stream (curve index) to draw from
     
     Returns:
         y_true, y_scores: True labels and predicted scores
     """
-    np.random.seed(42 + landmark_day)  # Reproducible
+    rng = panel_rng(stream)  # Reproducible
     
     # Performance improves with later landmark days
     if landmark_day == 3:
@@ -45,28 +62,19 @@ def generate_synthetic_roc_data(landmark_day, n_patients=147):
     # Generate labels (1 = died, 0 = survived)
     y_true = np.zeros(n_patients)
     y_true[:n_events] = 1
-    np.random.shuffle(y_true)
+    rng.shuffle(y_true)
     
-    # Generate scores that achieve target AUC
-    y_scores = np.random.beta(2, 5, n_patients)  # Base scores
-    
-    # Adjust scores to achieve target AUC
-    for _ in range(100):  # Iterative adjustment
-        current_auc = auc(*roc_curve(y_true, y_scores)[:2])
-        if abs(current_auc - auc_target) < 0.01:
-            break
-        
-        # Adjust scores based on labels
-        adjustment = (auc_target - current_auc) * 0.1
-        y_scores[y_true == 1] += adjustment
-        y_scores[y_true == 0] -= adjustment
-        y_scores = np.clip(y_scores, 0, 1)
+    # Bi-normal model: unit-variance classes separated by sqrt(2)*ppf(AUC)
+    # have the target AUC in expectation; norm.cdf maps scores into (0, 1)
+    latent = rng.standard_normal(n_patients)
+    latent[y_true == 1] += np.sqrt(2) * norm.ppf(auc_target)
+    y_scores = norm.cdf(latent)
     
     return y_true.astype(int), y_scores
 
 def smooth_roc_curve(fpr, tpr):
     """
-    Create smooth (convex) ROC curve using convex hull
+    Create smooth (convex) ROC curve using the upper convex hull
     
     Args:
         fpr, tpr: False positive rate and true positive rate
@@ -74,24 +82,23 @@ def smooth_roc_curve(fpr, tpr):
     Returns:
         fpr_smooth, tpr_smooth: Smoothed curves
     """
-    # Add corner points
+    # Add corner points and sort by FPR, then TPR
     points = np.column_stack([fpr, tpr])
     points = np.vstack([[0, 0], points, [1, 1]])
-    
-    try:
-        # Find convex hull
-        hull = ConvexHull(points)
-        hull_points = points[hull.vertices]
-        
-        # Sort by FPR
-        sorted_idx = np.argsort(hull_points[:, 0])
-        fpr_smooth = hull_points[sorted_idx, 0]
-        tpr_smooth = hull_points[sorted_idx, 1]
-        
-        return fpr_smooth, tpr_smooth
-    except:
-        # Fallback to original if convex hull fails
-        return fpr, tpr
+    points = points[np.lexsort((points[:, 1], points[:, 0]))]
+    
+    # Monotone chain: drop points that do not make a right turn
+    upper = []
+    for point in points:
+        while len(upper) >= 2:
+            (ax, ay), (bx, by) = upper[-2], upper[-1]
+            if (bx - ax) * (point[1] - ay) - (by - ay) * (point[0] - ax) < 0:
+                break
+            upper.pop()
+        upper.append(point)
+    
+    upper = np.array(upper)
+    return upper[:, 0], upper[:, 1]
 
 def create_corrected_roc_plot():
     """Create corrected Time-dependent ROC curves plot"""
@@ -105,8 +112,8 @@ def create_corrected_roc_plot():
     auc_values = []
     
     # Plot ROC curves
-    for day in landmark_days:
-        y_true, y_scores = generate_synthetic_roc_data(day)
+    for stream, day in enumerate(landmark_days):
+        y_true, y_scores = generate_synthetic_roc_data(day, stream=stream)
         fpr, tpr, _ = roc_curve(y_true, y_scores)
         roc_auc = auc(fpr, tpr)
         auc_values.append(roc_auc)
@@ -144,7 +151,7 @@ def create_corrected_roc_plot():
     ax2.plot(time_points, auc_over_time, 'b-', linewidth=3, marker='o', 
              markersize=8, label='TRS AUC')
     ax2.fill_between(time_points, auc_ci_lower, auc_ci_upper, 
-                     alpha=0.3, color='blue', label='95% CI')
+                     alpha=0.3, color='blue', label='95% CI', rasterized=True)
     
     # Add horizontal line at 0.5 (no discrimination)
     ax2.axhline(y=0.5, color='gray', linestyle='--', alpha=0.7, label='No discrimination')
@@ -172,9 +179,8 @@ if __name__ == "__main__":
     # Create corrected plot
     fig = create_corrected_roc_plot()
     
-    # Save to figures directory with high DPI
-    output_path = Path("figures/time_roc_corrected.png")
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    # Save to figures directory (300 DPI PNG unless --fmt svg/pdf)
+    output_path = save_figure(fig, Path("figures/time_roc_corrected.png"))
     
     print(f"✅ Corrected Time-dependent ROC saved to: {output_path}")
     print("🔧 Fixes applied:")
@@ -182,5 +188,6 @@ if __name__ == "__main__":
     print("   2. Added vertical dashed line at Day 7 with 'Peak AUC Day 7' annotation")
     print("   3. Improved visual appearance and formatting")
     
-    plt.show()
+    if "--show" in sys.argv:
+        plt.show()
 
@@ -12,6 +12,8 @@ This test suite validates all components of the TRS system including:
 import pytest
 import sys
 import os
+import threading
+import time
 import numpy as np
 import pandas as pd
 from datetime import datetime
@@ -20,10 +22,12 @@ from unittest.mock import patch, MagicMock
 # Add src directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from tracheo_risk_score.core import TRSCalculator, TRSResult
+from tracheo_risk_score.core import (
+    TRSCalculator, TRSResult, default_calculator, calculate_score
+)
 from tracheo_risk_score.constants import (
     TRS_CUTPOINTS, TRS_POINTS, RISK_CATEGORIES, 
-    OPTIMAL_THRESHOLDS, validate_constants
+    OPTIMAL_THRESHOLDS, SCORE_CATEGORIES, validate_constants
 )
 from tracheo_risk_score.validation import BootstrapValidator, PerformanceMetrics
 from tracheo_risk_score.utils import (
@@ -32,6 +36,12 @@ from tracheo_risk_score.utils import (
 )
 
 
+@pytest.fixture(scope="module")
+def calculator():
+    """Calculator shared by the module's tests (they do not modify it)."""
+    return TRSCalculator(log_calculations=False)
+
+
 class TestTRSConstants:
     """Test TRS constants and configuration."""
     
@@ -65,6 +75,13 @@ class TestTRSConstants:
             assert len(data["range"]) == 2
             assert 0 <= data["mortality_rate"] <= 1
     
+    def test_score_categories_lookup(self):
+        """Test that the score lookup table agrees with the category ranges."""
+        assert len(SCORE_CATEGORIES) == sum(TRS_POINTS.values()) + 1
+        for score, category in enumerate(SCORE_CATEGORIES):
+            min_score, max_score = RISK_CATEGORIES[category]["range"]
+            assert min_score <= score <= max_score
+    
     def test_optimal_thresholds_valid(self):
         """Test that optimal thresholds are properly defined."""
         for day, threshold_data in OPTIMAL_THRESHOLDS.items():
@@ -80,9 +97,10 @@ class TestTRSConstants:
 class TestTRSCalculator:
     """Test TRS calculator core functionality."""
     
-    def setup_method(self):
-        """Setup test fixtures."""
-        self.calculator = TRSCalculator(log_calculations=False)
+    @pytest.fixture(autouse=True)
+    def _bind_calculator(self, calculator):
+        """Bind the module-scoped calculator."""
+        self.calculator = calculator
     
     def test_calculator_initialization(self):
         """Test calculator initialization."""
@@ -178,26 +196,35 @@ class TestTRSCalculator:
         assert result.valid == False  # >2 missing components
         assert len(result.warnings) >= 5
     
-    def test_input_validation(self):
-        """Test input validation."""
-        # Test MELD out of range
-        with pytest.raises(ValueError, match="MELD score must be between"):
-            self.calculator.calculate_score(meld=50)  # Too high
-        
-        with pytest.raises(ValueError, match="MELD score must be between"):
-            self.calculator.calculate_score(meld=0)   # Too low
+    def test_details_rendering(self):
+        """Test that details are skipped only for anonymous silent calls."""
+        assert self.calculator.calculate_score(meld=25, hcc=False).details == []
         
-        # Test SAPS II out of range
-        with pytest.raises(ValueError, match="SAPS II score must be between"):
-            self.calculator.calculate_score(saps_ii=200)  # Too high
-        
-        # Test age out of range
-        with pytest.raises(ValueError, match="Age must be between"):
-            self.calculator.calculate_score(age=100)  # Too high
+        result = self.calculator.calculate_score(meld=25, hcc=False, patient_id="P001")
+        assert result.details == [
+            "MELD > 20 (25.0): +2 points",
+            "Hepatocellular carcinoma absent: +0 points",
+        ]
+    
+    @pytest.mark.parametrize('kwargs, match', [
+        ({'meld': 50}, "MELD score must be between"),             # Too high
+        ({'meld': 0}, "MELD score must be between"),              # Too low
+        ({'saps_ii': 200}, "SAPS II score must be between"),      # Too high
+        ({'age': 100}, "Age must be between"),                    # Too high
+        ({'platelets': 1000}, "Platelet count must be between"),  # Too high
+    ])
+    def test_input_validation(self, kwargs, match):
+        """Test input validation."""
+        with pytest.raises(ValueError, match=match):
+            self.calculator.calculate_score(**kwargs)
+    
+    def test_array_input_validation(self):
+        """Test vectorized input validation reports offending rows."""
+        with pytest.raises(ValueError, match=r"MELD score must be between .* rows \[1\]"):
+            self.calculator.calculate_scores_array({"meld": np.array([25, 50, np.nan])})
         
-        # Test platelets out of range
         with pytest.raises(ValueError, match="Platelet count must be between"):
-            self.calculator.calculate_score(platelets=1000)  # Too high
+            self.calculator.calculate_scores_array({"platelets": np.array([5, 100])})
     
     def test_batch_calculation(self):
         """Test batch calculation functionality."""
@@ -209,14 +236,103 @@ class TestTRSCalculator:
             {
                 "meld": 15, "saps_ii": 35, "age": 45, "platelets": 100,
                 "hcc": False, "cvvhd": False, "vhf": False, "patient_id": "P002"
+            },
+            {"meld": 22, "age": 60, "patient_id": "P003"},  # Mostly missing
+            {
+                "meld": 99, "saps_ii": 30, "age": 40, "platelets": 150,
+                "hcc": False, "cvvhd": False, "vhf": False, "patient_id": "P004"
             }
         ]
         
         results = self.calculator.calculate_batch(patients_data)
         
-        assert len(results) == 2
+        assert len(results) == 4
         assert all(isinstance(r, TRSResult) for r in results)
         assert results[0].total_score > results[1].total_score  # P001 higher risk
+        assert results[2].valid == False
+        assert results[3].risk_category == "ERROR"
+        
+        # DataFrame input takes the vectorized path with the same results
+        frame_results = self.calculator.calculate_batch(pd.DataFrame(patients_data))
+        assert [r.total_score for r in frame_results] == [r.total_score for r in results]
+        assert [r.warnings for r in frame_results] == [r.warnings for r in results]
+        assert [r.details for r in frame_results] == [r.details for r in results]
+        assert frame_results[3].details[0].endswith("got 99")  # Not 99.0
+        
+        # Columns of NumPy arrays are scored without building patient dicts
+        columns = {
+            key: np.array([patient.get(key, np.nan) for patient in patients_data])
+            for key in ("meld", "saps_ii", "age", "platelets", "hcc", "cvvhd", "vhf")
+        }
+        scores = self.calculator.calculate_batch(columns, return_scores_only=True)
+        assert scores.tolist() == [r.total_score for r in results]
+    
+    def test_batch_rejected_row_keeps_patient_id(self, caplog):
+        """Test that rejected DataFrame rows are reported under their patient_id."""
+        frame = pd.DataFrame({"patient_id": ["P1", "P9"], "meld": [25, 99]}, index=[5, 7])
+        
+        results = self.calculator.calculate_batch(frame)
+        
+        assert [r.total_score for r in results] == [2, -1]
+        assert "Error calculating TRS for P9" in caplog.text
+    
+    def test_batch_shares_timestamp(self):
+        """Test that batch results share one timestamp and it can be disabled."""
+        patients_data = [{"meld": 25}, {"meld": 15}]
+        
+        results = self.calculator.calculate_batch(patients_data)
+        assert isinstance(results[0].timestamp, int)
+        assert results[0].timestamp == results[1].timestamp
+        assert isinstance(results[0].calculated_at, datetime)
+        
+        untimed = TRSCalculator(log_calculations=False, record_time=False)
+        assert untimed.calculate_score(meld=25).timestamp is None
+    
+    def test_flag_changes_apply_to_all_paths(self):
+        """Test that reassigned flags and subclass overrides are honoured."""
+        calc = TRSCalculator(log_calculations=False)
+        calc.validate_inputs = False
+        assert calc.calculate_score(meld=99).total_score == 2
+        assert calc.calculate_batch([{"meld": 99}])[0].total_score == 2
+        assert calc.calculate_batch([{"meld": 99}], return_scores_only=True).tolist() == [2]
+        assert calc.calculate_batch({"meld": [99]}, return_scores_only=True).tolist() == [2]
+        
+        class FixedCalculator(TRSCalculator):
+            def calculate_score(self, *args, **kwargs):
+                return "overridden"
+        
+        assert FixedCalculator().calculate_score(meld=25) == "overridden"
+    
+    def test_default_calculator(self):
+        """Test that the default calculator is cached per thread and flags."""
+        calculator = default_calculator(log_calculations=False)
+        assert default_calculator(log_calculations=False) is calculator
+        assert default_calculator(validate_inputs=False) is not calculator
+        
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(default_calculator(log_calculations=False))
+        )
+        thread.start()
+        thread.join()
+        assert other[0] is not calculator
+        
+        assert calculate_score(meld=25, hcc=True).total_score == 3
+    
+    def test_batch_scores_only(self):
+        """Test that the scores-only batch matches the full results."""
+        patients_data = [
+            {"meld": 25, "hcc": True}, {"meld": 99}, {"platelets": 50}, {"meld": np.nan}
+        ]
+        
+        results = self.calculator.calculate_batch(patients_data)
+        assert results[3].total_score == -1
+        buffer = np.empty(len(patients_data), dtype=np.int8)
+        scores = self.calculator.calculate_batch(
+            patients_data, out=buffer, return_scores_only=True
+        )
+        assert scores is buffer
+        assert scores.tolist() == [r.total_score for r in results]
     
     def test_component_info(self):
         """Test component information retrieval."""
@@ -228,6 +344,9 @@ class TestTRSCalculator:
         assert "points" in meld_info
         assert meld_info["cutpoint"] == TRS_CUTPOINTS["MELD"]
         assert meld_info["points"] == TRS_POINTS["MELD"]
+        assert meld_info.cutpoint == TRS_CUTPOINTS["MELD"]
+        assert self.calculator.get_component_info("MELD") is meld_info
+        assert "cutpoint" not in self.calculator.get_component_info("HCC")
         
         # Test invalid component
         with pytest.raises(ValueError, match="Unknown component"):
@@ -255,7 +374,7 @@ class TestTRSResult:
             recommendation="Consider early tracheostomy",
             mortality_risk=0.47,
             details=["MELD > 20: +2 points"],
-            timestamp=datetime.now(),
+            timestamp=time.time_ns(),
             valid=True
         )
         
@@ -263,13 +382,39 @@ class TestTRSResult:
         assert result.risk_category == "HIGH"
         assert result.valid == True
         assert result.warnings == []  # Default empty list
+        
+        # Equality compares the component breakdown, not just the total
+        same = TRSResult(5, {"MELD": 2, "SAPS_II": 1}, "HIGH", "High Risk",
+                         "Consider early tracheostomy", 0.47, ["MELD > 20: +2 points"],
+                         result.timestamp)
+        other = TRSResult(5, {"HCC": 1, "CVVHD": 1, "VHF": 1}, "HIGH", "High Risk",
+                          "Consider early tracheostomy", 0.47, ["MELD > 20: +2 points"],
+                          result.timestamp)
+        assert result == same
+        assert result != other
+    
+    def test_component_scores_access(self):
+        """Test fixed-order component array and per-component access."""
+        calculator = TRSCalculator(log_calculations=False)
+        result = calculator.calculate_score(
+            meld=25, saps_ii=40, age=60, platelets=100,
+            hcc=True, cvvhd=False, vhf=False
+        )
+        
+        assert result.component_scores.shape == (7,)
+        assert result.component_scores.dtype == np.int8
+        assert result["MELD"] == 2
+        assert result["SAPS_II"] == 0
+        assert result["AGE"] == 1
+        assert result.component_dict["HCC"] == 1
+        assert sum(result.component_dict.values()) == result.total_score
     
     def test_result_with_warnings(self):
         """Test TRS result with warnings."""
         warnings = ["Missing data", "Out of range value"]
         result = TRSResult(
             total_score=3,
-            component_scores={},
+            component_scores=np.zeros(7, dtype=np.int8),
             risk_category="MEDIUM",
             risk_description="Medium Risk",
             recommendation="Monitor closely",
@@ -282,30 +427,32 @@ class TestTRSResult:
         
         assert result.warnings == warnings
         assert result.valid == False
+        assert isinstance(result.timestamp, int)  # datetime converted to ns
 
 
 class TestBootstrapValidator:
     """Test bootstrap validation functionality."""
     
-    def setup_method(self):
-        """Setup test fixtures."""
+    @classmethod
+    def setup_class(cls):
+        """Setup test fixtures once for the class (tests only read them)."""
         # Create synthetic test data
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         n_patients = 100
         
-        self.test_data = pd.DataFrame({
-            'meld': np.random.normal(22, 8, n_patients).clip(6, 40),
-            'saps_ii': np.random.normal(44, 12, n_patients).clip(0, 163),
-            'age': np.random.normal(56, 15, n_patients).clip(18, 80),
-            'platelets': np.random.normal(82, 40, n_patients).clip(10, 500),
-            'hcc': np.random.choice([True, False], n_patients, p=[0.3, 0.7]),
-            'cvvhd': np.random.choice([True, False], n_patients, p=[0.35, 0.65]),
-            'vhf': np.random.choice([True, False], n_patients, p=[0.26, 0.74]),
-            'death_90d': np.random.choice([0, 1], n_patients, p=[0.6, 0.4]),
-            'survival_time': np.random.exponential(45, n_patients).clip(1, 90)
+        cls.test_data = pd.DataFrame({
+            'meld': rng.normal(22, 8, n_patients).clip(6, 40),
+            'saps_ii': rng.normal(44, 12, n_patients).clip(0, 163),
+            'age': rng.normal(56, 15, n_patients).clip(18, 80),
+            'platelets': rng.normal(82, 40, n_patients).clip(10, 500),
+            'hcc': rng.choice([True, False], n_patients, p=[0.3, 0.7]),
+            'cvvhd': rng.choice([True, False], n_patients, p=[0.35, 0.65]),
+            'vhf': rng.choice([True, False], n_patients, p=[0.26, 0.74]),
+            'death_90d': rng.choice([0, 1], n_patients, p=[0.6, 0.4]),
+            'survival_time': rng.exponential(45, n_patients).clip(1, 90)
         })
         
-        self.validator = BootstrapValidator(n_bootstrap=10, random_seed=42)  # Small n for testing
+        cls.validator = BootstrapValidator(n_bootstrap=10, random_seed=42)  # Small n for testing
     
     def test_validator_initialization(self):
         """Test validator initialization."""
@@ -399,9 +546,9 @@ class TestUtilityFunctions:
     def test_batch_summary_creation(self):
         """Test batch summary creation."""
         results = [
-            TRSResult(0, {}, "LOW", "Low Risk", "Standard", 0.1, [], datetime.now(), True),
-            TRSResult(3, {}, "MEDIUM", "Medium Risk", "Monitor", 0.33, [], datetime.now(), True),
-            TRSResult(6, {}, "HIGH", "High Risk", "Tracheostomy", 0.47, [], datetime.now(), True),
+            TRSResult(0, np.zeros(7, dtype=np.int8), "LOW", "Low Risk", "Standard", 0.1, [], time.time_ns(), True),
+            TRSResult(3, np.zeros(7, dtype=np.int8), "MEDIUM", "Medium Risk", "Monitor", 0.33, [], time.time_ns(), True),
+            TRSResult(6, np.zeros(7, dtype=np.int8), "HIGH", "High Risk", "Tracheostomy", 0.47, [], time.time_ns(), True),
         ]
         
         summary = create_batch_summary(results)
@@ -461,9 +608,10 @@ class TestUtilityFunctions:
 class TestEdgeCases:
     """Test edge cases and error conditions."""
     
-    def setup_method(self):
-        """Setup test fixtures."""
-        self.calculator = TRSCalculator(log_calculations=False)
+    @pytest.fixture(autouse=True)
+    def _bind_calculator(self, calculator):
+        """Bind the module-scoped calculator."""
+        self.calculator = calculator
     
     def test_boundary_values(self):
         """Test calculations with boundary values."""